@@ -34,8 +34,31 @@ MCP サーバーに接続し、Claude AI を介してツールを自然言語で
     python -m mcp_client path/to/server.py
 """
 
-from .chat import ChatInterface
-from .connection import MCPConnection
-from .processor import QueryProcessor
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .chat import ChatInterface
+    from .connection import MCPConnection
+    from .processor import QueryProcessor
 
 __all__ = ["MCPConnection", "QueryProcessor", "ChatInterface"]
+
+# 公開クラスと定義モジュールの対応
+# anthropic / mcp の読み込みは重いため、初めて参照されたときにインポートする
+_LAZY_IMPORTS = {
+    "MCPConnection": ".connection",
+    "QueryProcessor": ".processor",
+    "ChatInterface": ".chat",
+}
+
+
+def __getattr__(name: str):
+    """公開クラスを初回参照時にインポートする（PEP 562）"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
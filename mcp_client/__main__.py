@@ -13,10 +13,6 @@
 import asyncio
 import sys
 
-from .chat import ChatInterface
-from .connection import MCPConnection
-from .processor import QueryProcessor
-
 
 def print_usage():
     """使用方法を表示"""
@@ -43,19 +39,48 @@ async def main(server_path: str):
             ↓
         ChatInterface (ユーザー UI)
     """
+    # anthropic / mcp の読み込みは重いため、使用方法の表示だけの場合は読み込まない
+    from anthropic import AsyncAnthropic
+
+    from .chat import ChatInterface
+    from .connection import MCPConnection
+    from .processor import QueryProcessor
+
     async with MCPConnection() as connection:
+        # Anthropic クライアントの初期化（環境変数の読み込み、HTTP クライアントの設定）を
+        # 別スレッドで進め、サーバーへの接続と並行させて起動時間を短縮する
+        # connect() は stdio のコンテキストを開くため、このタスク内で実行する
+        anthropic_future = asyncio.get_running_loop().run_in_executor(
+            None, AsyncAnthropic
+        )
+
         # サーバーに接続
         tool_names = await connection.connect(server_path)
         print(f"\nConnected to server with tools: {tool_names}")
 
         # コンポーネントを組み立て
-        processor = QueryProcessor(connection)
+        processor = QueryProcessor(connection, await anthropic_future)
         chat = ChatInterface(processor)
 
         # チャットループを開始
         await chat.run()
 
 
+def _get_loop_factory():
+    """
+    イベントループのファクトリを返す
+
+    uvloop が利用可能であれば libuv ベースのイベントループを使用する。
+    stdio や HTTPS の I/O 待ちが中心のため、標準のループより高速に動作する。
+    uvloop がない環境（Windows など）では標準のループにフォールバックする。
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 def run():
     """CLI エントリーポイント"""
     if len(sys.argv) < 2:
@@ -63,7 +88,7 @@ def run():
         sys.exit(1)
 
     server_path = sys.argv[1]
-    asyncio.run(main(server_path))
+    asyncio.run(main(server_path), loop_factory=_get_loop_factory())
 
 
 if __name__ == "__main__":
@@ -11,6 +11,12 @@
 - エラーハンドリング
 """
 
+import asyncio
+import os
+import sys
+from collections.abc import AsyncIterator
+from typing import Optional
+
 from .processor import QueryProcessor
 
 
@@ -28,6 +34,9 @@ class ChatInterface:
     # 終了コマンド
     QUIT_COMMAND = "quit"
 
+    # 標準入力から一度に読み込む最大バイト数
+    READ_SIZE = 65536
+
     def __init__(self, processor: QueryProcessor):
         """
         ChatInterface のコンストラクタ
@@ -36,6 +45,8 @@ class ChatInterface:
             processor: クエリ処理を行う QueryProcessor
         """
         self._processor = processor
+        # 標準入力から読み込んだが、まだ行として返していないバイト列
+        self._input_buffer = b""
 
     async def run(self):
         """
@@ -48,7 +59,7 @@ class ChatInterface:
 
         while True:
             try:
-                query = self._get_input()
+                query = await self._get_input()
 
                 if self._should_quit(query):
                     break
@@ -56,10 +67,18 @@ class ChatInterface:
                 if not query:
                     continue
 
-                response = await self._processor.process(query)
-                self._print_response(response)
+                await self._print_response(self._processor.process(query))
 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
+                # EOFError は入力の終端（Ctrl+D）
+                print("\n\nInterrupted. Goodbye!")
+                break
+            except asyncio.CancelledError:
+                # asyncio.run 配下では Ctrl+C はタスクのキャンセルとして届く
+                # キャンセル要求を取り消してから終了し、後処理（close）を通常どおり行う
+                # 他のキャンセル要求も残っている場合はそのまま伝播させる
+                if asyncio.current_task().uncancel() > 0:
+                    raise
                 print("\n\nInterrupted. Goodbye!")
                 break
             except Exception as e:
@@ -70,17 +89,86 @@ class ChatInterface:
         print("\nMCP Client Started!")
         print(f"Type your queries or '{self.QUIT_COMMAND}' to exit.")
 
-    def _get_input(self) -> str:
-        """ユーザー入力を取得"""
-        return input("\nQuery: ").strip()
+    async def _get_input(self) -> str:
+        """
+        ユーザー入力を取得する
+
+        標準入力が読み込み可能になるのをイベントループで待ち、入力待ちの間もループを止めない。
+        これにより、サーバーからの通知（tools/list_changed など）を処理し続けられる。
+        入力待ちのスレッドを作らないため、Ctrl+C での終了時も安全に停止できる。
+
+        Raises:
+            EOFError: 入力が終端に達した場合
+        """
+        sys.stdout.write("\nQuery: ")
+        sys.stdout.flush()
+
+        while b"\n" not in self._input_buffer:
+            chunk = await self._read_stdin()
+            if chunk is None:
+                # イベントループで監視できない標準入力（Windows、通常ファイルなど）
+                return self._read_line_blocking()
+            if not chunk:
+                if not self._input_buffer:
+                    raise EOFError
+                break
+            self._input_buffer += chunk
+
+        line, _, self._input_buffer = self._input_buffer.partition(b"\n")
+        return line.decode(sys.stdin.encoding or "utf-8", errors="replace").strip()
+
+    async def _read_stdin(self) -> Optional[bytes]:
+        """
+        標準入力が読み込み可能になるまで待ち、読み込んだバイト列を返す
+
+        Returns:
+            Optional[bytes]: 読み込んだバイト列（入力の終端では空）。
+                標準入力をイベントループで監視できない場合は None
+        """
+        loop = asyncio.get_running_loop()
+        fd = sys.stdin.fileno()
+        readable = loop.create_future()
+
+        def on_readable():
+            if not readable.done():
+                readable.set_result(None)
+
+        try:
+            loop.add_reader(fd, on_readable)
+        except (NotImplementedError, OSError):
+            return None
+
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+
+        return os.read(fd, self.READ_SIZE)
+
+    def _read_line_blocking(self) -> str:
+        """標準入力から 1 行をブロッキングで読み込む"""
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.strip()
 
     def _should_quit(self, query: str) -> bool:
         """終了すべきかどうかを判定"""
-        return query.lower() == self.QUIT_COMMAND
-
-    def _print_response(self, response: str):
-        """応答を表示"""
-        print("\n" + response)
+        # 長さが異なる入力は小文字化せずに判定する（長い入力での文字列生成を避ける）
+        return (
+            len(query) == len(self.QUIT_COMMAND)
+            and query.lower() == self.QUIT_COMMAND
+        )
+
+    async def _print_response(self, chunks: AsyncIterator[str]):
+        """応答をストリーミングで表示"""
+        # print() を介さず直接書き込み、断片ごとに即座に表示する
+        sys.stdout.write("\n")
+        async for chunk in chunks:
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+        sys.stdout.write("\n")
+        sys.stdout.flush()
 
     def _print_error(self, error: Exception):
         """エラーメッセージを表示"""
@@ -11,14 +11,41 @@ MCP サーバーへの接続確立とセッション管理を担当する。
 - リソースのクリーンアップ
 """
 
-from contextlib import AsyncExitStack
+import os
+import time
 from pathlib import Path
 from typing import Optional
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import stdio_client
 
 
+def _build_py_params(server_script_path: str) -> StdioServerParameters:
+    """Python サーバー: uv を使用して実行"""
+    path = Path(server_script_path).resolve()
+    return StdioServerParameters(
+        command="uv",
+        args=["--directory", str(path.parent), "run", path.name],
+        env=None,
+    )
+
+
+def _build_js_params(server_script_path: str) -> StdioServerParameters:
+    """JavaScript サーバー: node で直接実行"""
+    return StdioServerParameters(
+        command="node",
+        args=[server_script_path],
+        env=None,
+    )
+
+
+# 拡張子ごとのサーバー起動パラメータ作成関数
+_BUILDERS = {
+    ".py": _build_py_params,
+    ".js": _build_js_params,
+}
+
+
 class MCPConnection:
     """
     MCP サーバーへの接続を管理するクラス
@@ -34,18 +61,34 @@ class MCPConnection:
             tools = await connection.list_tools()
     """
 
-    def __init__(self):
-        """MCPConnection のコンストラクタ"""
+    def __init__(self, cache_ttl_seconds: Optional[float] = None):
+        """
+        MCPConnection のコンストラクタ
+
+        Args:
+            cache_ttl_seconds: ツール一覧キャッシュの有効期間（秒）。
+                None の場合は tools/list_changed 通知を受けるまで無期限
+        """
         # MCP サーバーとのセッション（connect で初期化される）
         # これが MCP アーキテクチャにおける「MCP Client」に該当
         self.session: Optional[ClientSession] = None
 
-        # AsyncExitStack: 複数の非同期コンテキストマネージャーを管理
-        self._exit_stack = AsyncExitStack()
+        # stdio トランスポートのコンテキストマネージャー（close で終了する）
+        # 管理するコンテキストは stdio と ClientSession の 2 つのみのため、
+        # AsyncExitStack を使わず直接 __aenter__ / __aexit__ を呼び出す
+        self._stdio_context = None
 
         # 接続状態
         self._connected = False
 
+        # ツール一覧のキャッシュ（tools/list の往復をクエリごとに行わないため）
+        self._tools_cache: Optional[list[dict]] = None
+        self._tools_cached_at = 0.0
+        self._cache_ttl_seconds = cache_ttl_seconds
+
+        # サーバー起動パラメータのキャッシュ（再接続時に再計算しないため）
+        self._server_params: dict[str, StdioServerParameters] = {}
+
     async def __aenter__(self):
         """非同期コンテキストマネージャーのエントリー"""
         return self
@@ -69,33 +112,46 @@ class MCPConnection:
 
         通信の仕組み:
             クライアント <--stdin/stdout--> サーバープロセス
+
+        既に接続済みの場合は、前の接続を閉じてから再接続する。
         """
-        server_params = self._create_server_params(server_script_path)
+        server_params = self._get_server_params(server_script_path)
+
+        # 前の接続が残っていれば、このタスク内で先に終了させる
+        if self._stdio_context is not None:
+            await self.close()
 
         # stdio トランスポートを確立
         # サーバープロセスを起動し、stdin/stdout を介した通信チャネルを作成
-        stdio_transport = await self._exit_stack.enter_async_context(
-            stdio_client(server_params)
-        )
-        stdio, write = stdio_transport
+        # stdout は SDK 内部で最大 64 KiB 単位のチャンクとして読み込まれ、
+        # 行単位に分割されるため、ここで追加のバッファリングは行わない
+        stdio_context = stdio_client(server_params)
+        stdio, write = await stdio_context.__aenter__()
+        self._stdio_context = stdio_context
 
         # MCP セッション（= MCP Client 層）を作成
-        self.session = await self._exit_stack.enter_async_context(
-            ClientSession(stdio, write)
-        )
+        session = ClientSession(stdio, write, message_handler=self._handle_message)
+        await session.__aenter__()
+        self.session = session
 
         # セッションを初期化（MCP ハンドシェイク）
         await self.session.initialize()
         self._connected = True
 
-        # 利用可能なツール名を返す
-        tools = await self.list_tools()
+        # ツール一覧を取得してキャッシュし、ツール名を返す
+        # 以降のクエリではこのキャッシュが使われる
+        tools = await self._fetch_tools()
         return [tool["name"] for tool in tools]
 
     async def list_tools(self) -> list[dict]:
         """
         サーバーが提供するツール一覧を取得する
 
+        結果はキャッシュされ、サーバーから tools/list_changed 通知を受けるか
+        TTL が切れるまで再取得しない。
+        返り値はキャッシュそのもの（Claude API にそのまま渡せる形式）のため、
+        呼び出し側で変更しないこと。
+
         Returns:
             list[dict]: ツール情報のリスト（name, description, input_schema を含む）
 
@@ -104,8 +160,20 @@ class MCPConnection:
         """
         self._ensure_connected()
 
+        if self._tools_cache is not None and not self._is_cache_expired():
+            return self._tools_cache
+
+        return await self._fetch_tools()
+
+    async def _fetch_tools(self) -> list[dict]:
+        """
+        サーバーからツール一覧を取得し、キャッシュに格納する
+
+        Returns:
+            list[dict]: ツール情報のリスト
+        """
         response = await self.session.list_tools()
-        return [
+        self._tools_cache = [
             {
                 "name": tool.name,
                 "description": tool.description,
@@ -113,6 +181,8 @@ class MCPConnection:
             }
             for tool in response.tools
         ]
+        self._tools_cached_at = time.monotonic()
+        return self._tools_cache
 
     async def call_tool(self, name: str, arguments: dict):
         """
@@ -133,14 +203,61 @@ class MCPConnection:
 
     async def close(self):
         """リソースをクリーンアップする"""
-        await self._exit_stack.aclose()
+        # 開いた順と逆順（セッション → stdio）で終了する
+        session, self.session = self.session, None
+        stdio_context, self._stdio_context = self._stdio_context, None
         self._connected = False
+        self._tools_cache = None
+
+        try:
+            if session is not None:
+                await session.__aexit__(None, None, None)
+        finally:
+            if stdio_context is not None:
+                await stdio_context.__aexit__(None, None, None)
 
     def _ensure_connected(self):
         """接続されていることを確認する"""
         if not self._connected or self.session is None:
             raise RuntimeError("Not connected to MCP server")
 
+    def _is_cache_expired(self) -> bool:
+        """ツール一覧キャッシュの TTL が切れているかを判定する"""
+        if self._cache_ttl_seconds is None:
+            return False
+        return time.monotonic() - self._tools_cached_at >= self._cache_ttl_seconds
+
+    async def _handle_message(self, message):
+        """
+        サーバーからのメッセージを処理する
+
+        tools/list_changed 通知を受けたらツール一覧キャッシュを破棄し、
+        次回の list_tools で再取得させる。
+        """
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            self._tools_cache = None
+
+    def _get_server_params(self, server_script_path: str) -> StdioServerParameters:
+        """
+        サーバー起動パラメータを取得する
+
+        一度作成したパラメータはスクリプトパスごとにキャッシュし、
+        再接続時にパス解決をやり直さないようにする。
+
+        Args:
+            server_script_path: サーバースクリプトのパス
+
+        Returns:
+            StdioServerParameters: サーバー起動パラメータ
+        """
+        server_params = self._server_params.get(server_script_path)
+        if server_params is None:
+            server_params = self._create_server_params(server_script_path)
+            self._server_params[server_script_path] = server_params
+        return server_params
+
     def _create_server_params(self, server_script_path: str) -> StdioServerParameters:
         """
         サーバー起動パラメータを作成する
@@ -154,24 +271,10 @@ class MCPConnection:
         Raises:
             ValueError: サポートされていないファイル形式の場合
         """
-        is_python = server_script_path.endswith(".py")
-        is_js = server_script_path.endswith(".js")
+        # 拡張子のみが必要なため Path は生成せず、文字列から直接取り出す
+        builder = _BUILDERS.get(os.path.splitext(server_script_path)[1])
 
-        if not (is_python or is_js):
+        if builder is None:
             raise ValueError("Server script must be a .py or .js file")
 
-        if is_python:
-            # Python サーバー: uv を使用して実行
-            path = Path(server_script_path).resolve()
-            return StdioServerParameters(
-                command="uv",
-                args=["--directory", str(path.parent), "run", path.name],
-                env=None,
-            )
-        else:
-            # JavaScript サーバー: node で直接実行
-            return StdioServerParameters(
-                command="node",
-                args=[server_script_path],
-                env=None,
-            )
+        return builder(server_script_path)
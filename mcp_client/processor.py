@@ -11,18 +11,25 @@
 - 最終応答の生成
 """
 
-from anthropic import Anthropic
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Optional
+
+from anthropic import AsyncAnthropic
 
 from .config import ANTHROPIC_MODEL, MAX_TOKENS
 from .connection import MCPConnection
 
+# Claude API が tool_result 内で受け付ける画像形式
+SUPPORTED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"})
+
 
 class QueryProcessor:
     """
     クエリ処理クラス
 
     ユーザーからのクエリを受け取り、以下のフローで処理する:
-    1. MCP サーバーからツール一覧を取得
+    1. ツール一覧を取得（接続時にキャッシュ済み）
     2. クエリとツール定義を Claude API に送信
     3. Claude の応答を解析（テキスト or ツール使用リクエスト）
     4. 必要に応じてツールを実行し、結果を Claude に返送
@@ -30,29 +37,36 @@ class QueryProcessor:
 
     使用例:
         processor = QueryProcessor(connection)
-        response = await processor.process("天気を教えて")
+        async for chunk in processor.process("天気を教えて"):
+            print(chunk, end="")
     """
 
-    def __init__(self, connection: MCPConnection):
+    def __init__(
+        self, connection: MCPConnection, anthropic: Optional[AsyncAnthropic] = None
+    ):
         """
         QueryProcessor のコンストラクタ
 
         Args:
             connection: MCP サーバーへの接続
+            anthropic: 使用する Anthropic クライアント（省略時は新規作成）
         """
         self._connection = connection
         # Anthropic クライアント: 環境変数 ANTHROPIC_API_KEY を自動的に読み込む
-        self._anthropic = Anthropic()
+        # 非同期版を使い、応答待ちの間もイベントループ（MCP の stdio 通信）を止めない
+        self._anthropic = anthropic or AsyncAnthropic()
 
-    async def process(self, query: str) -> str:
+    async def process(self, query: str) -> AsyncIterator[str]:
         """
         ユーザークエリを処理し、応答を生成する
 
+        Claude の応答はストリーミングで受信し、届いたテキストから順に返す。
+
         Args:
             query: ユーザーからの自然言語クエリ
 
-        Returns:
-            str: Claude からの応答テキスト
+        Yields:
+            str: Claude からの応答テキストの断片
 
         処理フロー:
             1. ツール一覧を取得
@@ -62,78 +76,163 @@ class QueryProcessor:
         # メッセージ履歴を初期化
         messages = [{"role": "user", "content": query}]
 
-        # サーバーから利用可能なツール一覧を取得
+        # 利用可能なツール一覧を取得
+        # connect() 時にキャッシュ済みのため、通常はサーバーへの往復は発生しない
+        # キャッシュ済みのリストをコピーせずにそのまま API に渡す（読み取り専用）
         available_tools = await self._connection.list_tools()
 
-        # Claude API にクエリを送信
-        response = self._anthropic.messages.create(
+        # Claude API にクエリを送信し、テキストを受信しながら返す
+        async with self._anthropic.messages.stream(
             model=ANTHROPIC_MODEL,
             max_tokens=MAX_TOKENS,
             messages=messages,
             tools=available_tools,
-        )
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            # ツール使用リクエストは最終メッセージから取得する
+            response = await stream.get_final_message()
 
         # 応答を処理
-        return await self._handle_response(response, messages, available_tools)
+        async for chunk in self._handle_response(response, messages, available_tools):
+            yield chunk
 
-    async def _handle_response(self, response, messages: list, tools: list) -> str:
+    async def _handle_response(
+        self, response, messages: list, tools: list
+    ) -> AsyncIterator[str]:
         """
         Claude の応答を処理する
 
+        テキスト部分はストリーミング時に返却済みのため、
+        ここではツール使用リクエストのみを処理する。
+        複数のツール使用リクエストは並行して実行し、
+        全ての結果をまとめて 1 回の API 呼び出しで Claude に返送する。
+
         Args:
             response: Claude API からの応答
-            messages: メッセージ履歴
+            messages: メッセージ履歴（更新される）
             tools: 利用可能なツール一覧
 
-        Returns:
-            str: 処理結果のテキスト
+        Yields:
+            str: ツール実行結果を含む応答テキストの断片
         """
-        result_parts = []
+        # テキストのみの応答: 返却済みのため、これ以上の処理は不要
+        if response.stop_reason != "tool_use":
+            return
+
+        tool_requests = [
+            content for content in response.content if content.type == "tool_use"
+        ]
 
-        for content in response.content:
-            if content.type == "text":
-                # テキスト応答: そのまま結果に追加
-                result_parts.append(content.text)
+        # デバッグ情報
+        for tool_request in tool_requests:
+            yield f"\n[Calling tool {tool_request.name} with args {tool_request.input}]"
+        yield "\n"
 
-            elif content.type == "tool_use":
-                # ツール使用リクエスト: ツールを実行
-                tool_result = await self._execute_tool(content, messages)
-                result_parts.append(tool_result)
+        # MCP サーバー経由でツールを並行実行
+        tool_results = await self._execute_tools(tool_requests)
 
-        return "\n".join(result_parts)
+        # アシスタントの応答とツール実行結果を会話履歴に追加
+        messages.append({"role": "assistant", "content": response.content})
+        messages.append({"role": "user", "content": tool_results})
 
-    async def _execute_tool(self, tool_request, messages: list) -> str:
+        # ツール結果を基に Claude から最終応答を取得
+        async with self._anthropic.messages.stream(
+            model=ANTHROPIC_MODEL,
+            max_tokens=MAX_TOKENS,
+            messages=messages,
+            tools=tools,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+    async def _execute_tools(self, tool_requests: list) -> list[dict]:
         """
-        ツールを実行し、Claude から最終応答を取得する
+        ツールを並行実行し、Claude に返送する tool_result ブロックを作成する
+
+        一部のツールが失敗しても他の結果は破棄せず、
+        失敗したツールはエラーとして Claude に返す。
 
         Args:
-            tool_request: Claude からのツール使用リクエスト
-            messages: メッセージ履歴（更新される）
+            tool_requests: Claude からのツール使用リクエストのリスト
 
         Returns:
-            str: ツール実行結果を含む応答テキスト
+            list[dict]: tool_result ブロックのリスト（リクエストと同じ順序）
         """
-        tool_name = tool_request.name
-        tool_args = tool_request.input
+        results = await asyncio.gather(
+            *(
+                self._connection.call_tool(tool_request.name, tool_request.input)
+                for tool_request in tool_requests
+            ),
+            return_exceptions=True,
+        )
 
-        # MCP サーバー経由でツールを実行
-        result = await self._connection.call_tool(tool_name, tool_args)
+        return [
+            self._build_tool_result(tool_request, result)
+            for tool_request, result in zip(tool_requests, results)
+        ]
 
-        # デバッグ情報
-        debug_info = f"[Calling tool {tool_name} with args {tool_args}]"
+    def _build_tool_result(self, tool_request, result) -> dict:
+        """
+        ツール実行結果から tool_result ブロックを作成する
 
-        # ツール実行結果を会話履歴に追加
-        if hasattr(tool_request, "text") and tool_request.text:
-            messages.append({"role": "assistant", "content": tool_request.text})
+        Args:
+            tool_request: Claude からのツール使用リクエスト
+            result: ツールの実行結果、または実行時に発生した例外（キャンセルを含む）
 
-        messages.append({"role": "user", "content": result.content})
+        Returns:
+            dict: tool_result ブロック
+        """
+        # return_exceptions=True では CancelledError（BaseException）も結果として返る
+        if isinstance(result, BaseException):
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_request.id,
+                "content": f"Error: {str(result) or type(result).__name__}",
+                "is_error": True,
+            }
+
+        return {
+            "type": "tool_result",
+            "tool_use_id": tool_request.id,
+            "content": [
+                self._convert_tool_content(content) for content in result.content
+            ],
+            "is_error": result.isError,
+        }
+
+    def _convert_tool_content(self, content) -> dict:
+        """
+        MCP のツール出力ブロックを Claude API のコンテンツブロックに変換する
 
-        # ツール結果を基に Claude から最終応答を取得
-        response = self._anthropic.messages.create(
-            model=ANTHROPIC_MODEL,
-            max_tokens=MAX_TOKENS,
-            messages=messages,
-        )
+        テキストと対応形式の画像はそのまま渡し、テキストのリソースは本文を渡す。
+        それ以外（音声、バイナリのリソース、リソースリンクなど）は
+        省略したことを示すテキストに置き換え、Claude に空の結果が届かないようにする。
 
-        final_response = response.content[0].text
-        return f"{debug_info}\n{final_response}"
+        Args:
+            content: MCP のツール出力ブロック
+
+        Returns:
+            dict: Claude API のコンテンツブロック
+        """
+        if content.type == "text":
+            return {"type": "text", "text": content.text}
+
+        if content.type == "image" and content.mimeType in SUPPORTED_IMAGE_TYPES:
+            return {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": content.mimeType,
+                    "data": content.data,
+                },
+            }
+
+        if content.type == "resource" and hasattr(content.resource, "text"):
+            return {"type": "text", "text": content.resource.text}
+
+        mime_type = getattr(content, "mimeType", None) or getattr(
+            getattr(content, "resource", None), "mimeType", None
+        )
+        description = f"{content.type} ({mime_type})" if mime_type else content.type
+        return {"type": "text", "text": f"[Omitted {description} content]"}